@@ -8,13 +8,15 @@ Public API:
     capture(name: str = "default") -> dict
         Capture the current Python environment.
     
-    restore(name: str = "default", dry_run: bool = False) -> None
+    restore(name: str = "default", dry_run: bool = False, parallel: Optional[int] = None,
+            force: bool = False) -> None
         Restore a previously captured environment.
     
     embed(name: str = "default", notebook_path: Optional[str] = None) -> None
         Embed a snapshot into notebook metadata for self-reproducibility.
     
-    restore_from_nb(notebook_path: Optional[str] = None, dry_run: bool = False) -> None
+    restore_from_nb(notebook_path: Optional[str] = None, dry_run: bool = False,
+                    parallel: Optional[int] = None, force: bool = False) -> None
         Restore environment from notebook-embedded snapshot.
 
 Example:
@@ -64,18 +66,32 @@ __all__ = [
 ]
 
 
-# Display helpful message on import in interactive environments
+# Display helpful message on import in interactive environments. The check
+# keeps the flag across importlib.reload(), which re-runs this module in the
+# same namespace.
+if "_WELCOME_SHOWN" not in globals():
+    _WELCOME_SHOWN = False
+
+
 def _show_welcome():
     """Show welcome message in interactive environments."""
+    global _WELCOME_SHOWN
+    if _WELCOME_SHOWN:
+        return
+    
     try:
         from .colab import is_jupyter
         if is_jupyter():
-            print(f"snapmyenv v{__version__} loaded")
-            print("Quick start:")
-            print("  snapmyenv.capture()        - Snapshot current environment")
-            print("  snapmyenv.restore()        - Restore environment")
-            print("  snapmyenv.embed()          - Embed in notebook metadata")
-            print("  snapmyenv.restore_from_nb() - Restore from notebook")
+            # One write instead of one per line; each flush hits the kernel socket
+            sys.stdout.write("\n".join([
+                f"snapmyenv v{__version__} loaded",
+                "Quick start:",
+                "  snapmyenv.capture()        - Snapshot current environment",
+                "  snapmyenv.restore()        - Restore environment",
+                "  snapmyenv.embed()          - Embed in notebook metadata",
+                "  snapmyenv.restore_from_nb() - Restore from notebook",
+            ]) + "\n")
+            _WELCOME_SHOWN = True
     except:
         pass
 
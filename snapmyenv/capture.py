@@ -1,20 +1,51 @@
 """Environment capture functionality."""
 
+import os
 import sys
-import platform
-import subprocess
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import warnings
 
 from .models import EnvironmentSnapshot, Package
-from .colab import is_colab
+from .store import (
+    SnapshotStore,
+    clear_persisted_snapshots,
+    delete_persisted_snapshot,
+    load_persisted_snapshot,
+    persist_snapshot,
+)
+from .colab import get_environment_type
 from .exceptions import CaptureError
 from .__version__ import __version__
 
 
-# Global storage for snapshots in the current session
-_SNAPSHOTS: Dict[str, EnvironmentSnapshot] = {}
+# Global storage for snapshots in the current session; older snapshots
+# are spilled to disk so memory use stays bounded
+_SNAPSHOTS: SnapshotStore = SnapshotStore()
+
+# Most recent capture, keyed by the import-path fingerprint it was taken under
+_CAPTURE_CACHE: Optional[Tuple[tuple, EnvironmentSnapshot]] = None
+
+
+def _environment_fingerprint() -> tuple:
+    """
+    Compute a cheap fingerprint of the import path.
+    
+    Installing, upgrading or removing a package adds or removes entries in
+    its site directory, which bumps that directory's mtime.
+    
+    Returns:
+        Tuple of (path, mtime_ns) pairs for every sys.path entry.
+    """
+    fingerprint = []
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            mtime = None
+        fingerprint.append((entry, mtime))
+    return tuple(fingerprint)
 
 
 def get_installed_packages() -> List[Package]:
@@ -27,36 +58,26 @@ def get_installed_packages() -> List[Package]:
     Raises:
         CaptureError: If package list cannot be retrieved.
     """
+    # Deferred: importlib.metadata pulls in the email package on import
+    import importlib.metadata as im
+    
     try:
-        # Use pip list --format=json for reliable parsing
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "list", "--format=json"],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=30,
-        )
-        
-        import json
-        packages_data = json.loads(result.stdout)
-        
         packages = []
-        for pkg_data in packages_data:
+        seen = set()
+        for dist in im.distributions():
             try:
-                packages.append(Package(
-                    name=pkg_data["name"],
-                    version=pkg_data["version"]
-                ))
-            except (KeyError, ValueError) as e:
-                warnings.warn(f"Skipping malformed package entry: {pkg_data}")
+                package = Package(name=dist.metadata["Name"], version=dist.version)
+            except ValueError:
+                warnings.warn(f"Skipping malformed package entry: {dist.metadata['Name']!r}")
                 continue
+            # Earlier sys.path entries shadow later ones, same as pip list
+            if package.canonical_name in seen:
+                continue
+            seen.add(package.canonical_name)
+            packages.append(package)
         
         return packages
         
-    except subprocess.TimeoutExpired:
-        raise CaptureError("Timeout while retrieving package list")
-    except subprocess.CalledProcessError as e:
-        raise CaptureError(f"Failed to retrieve package list: {e.stderr}")
     except Exception as e:
         raise CaptureError(f"Unexpected error retrieving packages: {e}")
 
@@ -78,29 +99,47 @@ def capture(name: str = "default", metadata: Optional[Dict[str, str]] = None) ->
     if not name or not isinstance(name, str):
         raise CaptureError("Snapshot name must be a non-empty string")
     
+    global _CAPTURE_CACHE
+    
     try:
-        # Get installed packages
-        packages = get_installed_packages()
-        
-        # Create snapshot
         # FIX: Use datetime.now(timezone.utc) instead of deprecated utcnow()
         timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        fingerprint = _environment_fingerprint()
         
-        snapshot = EnvironmentSnapshot(
-            name=name,
-            python_version=f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
-            platform_system=platform.system(),
-            platform_release=platform.release(),
-            platform_machine=platform.machine(),
-            is_colab=is_colab(),
-            packages=packages,
-            timestamp=timestamp,
-            snapmyenv_version=__version__,
-            metadata=metadata or {},
-        )
+        if _CAPTURE_CACHE is not None and _CAPTURE_CACHE[0] == fingerprint:
+            # Nothing was installed since the last capture; reuse its packages
+            snapshot = replace(
+                _CAPTURE_CACHE[1],
+                name=name,
+                packages=list(_CAPTURE_CACHE[1].packages),
+                timestamp=timestamp,
+                metadata=metadata or {},
+            )
+        else:
+            import platform
+            
+            # Get installed packages
+            packages = get_installed_packages()
+            
+            # Create snapshot
+            snapshot = EnvironmentSnapshot(
+                name=name,
+                python_version=f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+                platform_system=platform.system(),
+                platform_release=platform.release(),
+                platform_machine=platform.machine(),
+                is_colab=get_environment_type() == 'colab',
+                packages=packages,
+                timestamp=timestamp,
+                snapmyenv_version=__version__,
+                metadata=metadata or {},
+            )
         
-        # Store in session
+        _CAPTURE_CACHE = (fingerprint, snapshot)
+        
+        # Store in session, and on disk for later sessions
         _SNAPSHOTS[name] = snapshot
+        persist_snapshot(snapshot)
         
         # Return dictionary representation
         snapshot_dict = snapshot.to_dict()
@@ -108,7 +147,7 @@ def capture(name: str = "default", metadata: Optional[Dict[str, str]] = None) ->
         print(f"✓ Captured environment '{name}'")
         print(f"  Python: {snapshot.python_version}")
         print(f"  Platform: {snapshot.platform_system}")
-        print(f"  Packages: {len(packages)}")
+        print(f"  Packages: {len(snapshot.packages)}")
         print(f"  Colab: {'Yes' if snapshot.is_colab else 'No'}")
         
         return snapshot_dict
@@ -123,13 +162,22 @@ def get_snapshot(name: str = "default") -> Optional[EnvironmentSnapshot]:
     """
     Get a stored snapshot by name.
     
+    Snapshots not captured in this session are looked up in the on-disk
+    cache written by capture() in earlier sessions of the same environment.
+    
     Args:
         name: Name of the snapshot to retrieve.
         
     Returns:
         EnvironmentSnapshot object or None if not found.
     """
-    return _SNAPSHOTS.get(name)
+    snapshot = _SNAPSHOTS.get(name)
+    if snapshot is None:
+        snapshot = load_persisted_snapshot(name)
+        if snapshot is not None:
+            print(f"Loaded snapshot '{name}' (captured {snapshot.timestamp}) from the disk cache")
+            _SNAPSHOTS[name] = snapshot
+    return snapshot
 
 
 def list_snapshots() -> List[str]:
@@ -142,6 +190,31 @@ def list_snapshots() -> List[str]:
     return list(_SNAPSHOTS.keys())
 
 
-def clear_snapshots() -> None:
-    """Clear all stored snapshots from the current session."""
-    _SNAPSHOTS.clear()
\ No newline at end of file
+def delete_snapshot(name: str) -> bool:
+    """
+    Delete a snapshot from the session and from the on-disk cache.
+    
+    Args:
+        name: Name of the snapshot to delete.
+        
+    Returns:
+        True if the snapshot existed in either place.
+    """
+    in_session = _SNAPSHOTS.pop(name, None) is not None
+    on_disk = delete_persisted_snapshot(name)
+    return in_session or on_disk
+
+
+def clear_snapshots(persisted: bool = False) -> None:
+    """
+    Clear all stored snapshots from the current session.
+    
+    Args:
+        persisted: If True, also delete every snapshot in this environment's
+                  on-disk cache, including ones saved by other sessions.
+    """
+    global _CAPTURE_CACHE
+    _SNAPSHOTS.clear()
+    if persisted:
+        clear_persisted_snapshots()
+    _CAPTURE_CACHE = None
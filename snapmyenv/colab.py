@@ -1,9 +1,16 @@
 """Google Colab detection and utilities."""
 
+import functools
+import importlib.util
 import sys
 from typing import Optional
 
 
+# Environment type, resolved once per process by get_environment_type()
+_ENV_TYPE: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=None)
 def is_colab() -> bool:
     """
     Detect if running in Google Colab.
@@ -11,13 +18,18 @@ def is_colab() -> bool:
     Returns:
         True if running in Google Colab, False otherwise.
     """
-    try:
-        import google.colab
+    # On Colab the runtime has already imported it
+    if "google.colab" in sys.modules:
         return True
-    except ImportError:
+    
+    try:
+        # Locate the module without running its import-time side effects
+        return importlib.util.find_spec("google.colab") is not None
+    except (ImportError, ValueError):
         return False
 
 
+@functools.lru_cache(maxsize=None)
 def is_jupyter() -> bool:
     """
     Detect if running in any Jupyter environment.
@@ -41,17 +53,23 @@ def get_environment_type() -> str:
     """
     Get the type of environment we're running in.
     
+    Resolved on the first call and reused for the rest of the process.
+    
     Returns:
         One of: 'colab', 'jupyter', 'python'
     """
-    if is_colab():
-        return 'colab'
-    elif is_jupyter():
-        return 'jupyter'
-    else:
-        return 'python'
+    global _ENV_TYPE
+    if _ENV_TYPE is None:
+        if is_colab():
+            _ENV_TYPE = 'colab'
+        elif is_jupyter():
+            _ENV_TYPE = 'jupyter'
+        else:
+            _ENV_TYPE = 'python'
+    return _ENV_TYPE
 
 
+@functools.lru_cache(maxsize=None)
 def get_colab_version() -> Optional[str]:
     """
     Get Google Colab version if available.
@@ -62,12 +80,8 @@ def get_colab_version() -> Optional[str]:
     if not is_colab():
         return None
     
-    try:
-        import google.colab
-        # Colab doesn't expose version directly, so we return a generic indicator
-        return "colab"
-    except ImportError:
-        return None
+    # Colab doesn't expose version directly, so we return a generic indicator
+    return "colab"
 
 
 def ensure_jupyter() -> None:
@@ -1,16 +1,65 @@
 """Data models for environment snapshots."""
 
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import Dict, List, Optional
-import sys
-import platform
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 import json
+import re
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
+
+
+_NAME_SEPARATORS = re.compile(r"[-_.]+")
+_PYTHON_VERSION = re.compile(r"(\d+)\.(\d+)(?:\.(\d+))?")
+
+
+def _orjson_dumps_indented(data) -> Optional[bytes]:
+    """
+    Serialize data with orjson, as json.dumps(data, indent=2) would.
+    
+    orjson writes non-ASCII characters as raw UTF-8 where json escapes them,
+    and rejects some inputs json accepts (e.g. non-string keys). In those
+    cases None is returned so callers fall back to json, and output does not
+    depend on whether orjson is installed. Floats in exponent notation are
+    still written differently (1e16 vs 1e+16).
+    
+    Returns:
+        Indented JSON as bytes, or None if json should be used instead.
+    """
+    if orjson is None:
+        return None
+    try:
+        dumped = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    except orjson.JSONEncodeError:
+        return None
+    return dumped if dumped.isascii() else None
+
+
+def canonicalize_name(name: str) -> str:
+    """
+    Normalize a package name per PEP 503.
+    
+    Equivalent to packaging.utils.canonicalize_name, which is not a
+    dependency of snapmyenv.
+    
+    Args:
+        name: Package name as written, e.g. "Typing_Extensions".
+        
+    Returns:
+        Canonical name, e.g. "typing-extensions".
+    """
+    return _NAME_SEPARATORS.sub("-", name).lower()
 
 
 @dataclass
 class Package:
     """Represents an installed Python package."""
+    # No per-instance __dict__; snapshots hold hundreds of these
+    __slots__ = ("name", "version", "canonical_name")
+    
     name: str
     version: str
     
@@ -20,6 +69,12 @@ class Package:
             raise ValueError("Package name cannot be empty")
         if not self.version:
             raise ValueError("Package version cannot be empty")
+        self.canonical_name = canonicalize_name(self.name)
+    
+    @property
+    def spec(self) -> str:
+        """Pinned requirement specifier, e.g. "numpy==1.24.0"."""
+        return f"{self.name}=={self.version}"
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -29,6 +84,20 @@ class Package:
     def from_dict(cls, data: dict) -> "Package":
         """Create from dictionary."""
         return cls(name=data["name"], version=data["version"])
+    
+    @classmethod
+    def from_dict_unchecked(cls, data: dict) -> "Package":
+        """Create from dictionary without validation, for trusted input."""
+        return cls._fast_new(data["name"], data["version"])
+    
+    @classmethod
+    def _fast_new(cls, name: str, version: str) -> "Package":
+        """Create without running __post_init__ validation."""
+        pkg = object.__new__(cls)
+        pkg.name = name
+        pkg.version = version
+        pkg.canonical_name = canonicalize_name(name)
+        return pkg
 
 
 @dataclass
@@ -54,6 +123,10 @@ class EnvironmentSnapshot:
             raise ValueError("Python version cannot be empty")
         if not isinstance(self.packages, list):
             raise ValueError("Packages must be a list")
+        # Lookup index for get_package(), built on first use. Not a field,
+        # so it stays out of repr(), comparisons and dataclasses.asdict().
+        self._index: Optional[Dict[str, Tuple[int, Package]]] = None
+        self._index_key: Optional[Tuple[int, int]] = None
     
     def to_dict(self) -> dict:
         """Convert snapshot to dictionary."""
@@ -64,16 +137,24 @@ class EnvironmentSnapshot:
             "platform_release": self.platform_release,
             "platform_machine": self.platform_machine,
             "is_colab": self.is_colab,
-            "packages": [pkg.to_dict() for pkg in self.packages],
+            "packages": [{"name": pkg.name, "version": pkg.version} for pkg in self.packages],
             "timestamp": self.timestamp,
             "snapmyenv_version": self.snapmyenv_version,
             "metadata": self.metadata,
         }
     
     @classmethod
-    def from_dict(cls, data: dict) -> "EnvironmentSnapshot":
-        """Create snapshot from dictionary."""
-        packages = [Package.from_dict(pkg) for pkg in data["packages"]]
+    def from_dict(cls, data: dict, trusted: bool = False) -> "EnvironmentSnapshot":
+        """
+        Create snapshot from dictionary.
+        
+        Args:
+            data: Dictionary representation of a snapshot.
+            trusted: If True, skip per-package validation. Only use for data
+                    produced by to_dict() or to_json().
+        """
+        make_package = Package.from_dict_unchecked if trusted else Package.from_dict
+        packages = [make_package(pkg) for pkg in data["packages"]]
         return cls(
             name=data["name"],
             python_version=data["python_version"],
@@ -89,24 +170,61 @@ class EnvironmentSnapshot:
     
     def to_json(self, indent: int = 2) -> str:
         """Convert snapshot to JSON string."""
-        return json.dumps(self.to_dict(), indent=indent)
+        data = self.to_dict()
+        if indent == 2:
+            dumped = _orjson_dumps_indented(data)
+            if dumped is not None:
+                return dumped.decode()
+        return json.dumps(data, indent=indent)
     
     @classmethod
-    def from_json(cls, json_str: str) -> "EnvironmentSnapshot":
-        """Create snapshot from JSON string."""
-        data = json.loads(json_str)
-        return cls.from_dict(data)
+    def from_json(cls, json_str: str, trusted: bool = False) -> "EnvironmentSnapshot":
+        """
+        Create snapshot from JSON string.
+        
+        Args:
+            json_str: JSON representation of a snapshot.
+            trusted: If True, skip per-package validation. Only use for JSON
+                    written by to_json().
+        """
+        data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+        return cls.from_dict(data, trusted=trusted)
+    
+    @cached_property
+    def python_version_info(self) -> Optional[Tuple[int, ...]]:
+        """Python version as an int tuple, e.g. (3, 10, 0), or None if unparseable."""
+        match = _PYTHON_VERSION.match(self.python_version)
+        if match is None:
+            return None
+        return tuple(int(part) for part in match.groups() if part is not None)
     
     def get_package_count(self) -> int:
         """Get number of packages in snapshot."""
         return len(self.packages)
     
     def get_package(self, name: str) -> Optional[Package]:
-        """Get package by name."""
-        for pkg in self.packages:
-            if pkg.name.lower() == name.lower():
-                return pkg
-        return None
+        """Get package by name, matched per PEP 503."""
+        canonical = canonicalize_name(name)
+        # Reassigning packages or changing its length invalidates the index
+        # outright; an element replaced in place is caught by the checks below
+        key = (id(self.packages), len(self.packages))
+        fresh = self._index is None or self._index_key != key
+        if fresh:
+            self._build_index(key)
+        
+        entry = self._index.get(canonical)
+        if not fresh and (entry is None or self.packages[entry[0]] is not entry[1]):
+            # Stale hit, or a miss that an in-place replacement may explain
+            self._build_index(key)
+            entry = self._index.get(canonical)
+        return entry[1] if entry is not None else None
+    
+    def _build_index(self, key: Tuple[int, int]) -> None:
+        """Index packages by canonical name, keeping each name's first entry."""
+        self._index = {}
+        for position, pkg in enumerate(self.packages):
+            self._index.setdefault(pkg.canonical_name, (position, pkg))
+        self._index_key = key
     
     def format_summary(self) -> str:
         """Generate human-readable summary."""
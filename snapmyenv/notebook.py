@@ -5,15 +5,27 @@ import warnings
 from pathlib import Path
 from typing import Optional
 
-from .models import EnvironmentSnapshot
+from .models import EnvironmentSnapshot, _orjson_dumps_indented
 from .capture import get_snapshot
-from .restore import restore_from_dict
-from .colab import ensure_jupyter, is_jupyter
+from .restore import restore_snapshot
 from .exceptions import NotebookError
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional speedup, see the "fast" extra
+    ijson = None
+
 
 METADATA_KEY = "snapmyenv_snapshot"
 
+# Notebook path for this kernel, once successfully detected
+_CACHED_NB_PATH: Optional[Path] = None
+
 
 def get_notebook_path() -> Optional[Path]:
     """
@@ -22,6 +34,10 @@ def get_notebook_path() -> Optional[Path]:
     Returns:
         Path to the notebook file, or None if it cannot be determined.
     """
+    global _CACHED_NB_PATH
+    if _CACHED_NB_PATH is not None:
+        return _CACHED_NB_PATH
+    
     try:
         from IPython import get_ipython
         ipython = get_ipython()
@@ -33,7 +49,9 @@ def get_notebook_path() -> Optional[Path]:
         if hasattr(ipython, 'kernel') and hasattr(ipython.kernel, 'session'):
             session = ipython.kernel.session
             if hasattr(session, 'filename'):
-                return Path(session.filename)
+                # Only successes are cached; detection may work later on
+                _CACHED_NB_PATH = Path(session.filename)
+                return _CACHED_NB_PATH
         
         return None
         
@@ -55,8 +73,11 @@ def read_notebook(notebook_path: Path) -> dict:
         NotebookError: If notebook cannot be read.
     """
     try:
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # Parse raw bytes, skipping the text-IO decode layer
+        data = Path(notebook_path).read_bytes()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data.decode('utf-8'))
     except FileNotFoundError:
         raise NotebookError(f"Notebook not found: {notebook_path}")
     except json.JSONDecodeError as e:
@@ -65,6 +86,37 @@ def read_notebook(notebook_path: Path) -> dict:
         raise NotebookError(f"Failed to read notebook: {e}")
 
 
+def read_notebook_metadata(notebook_path: Path) -> dict:
+    """
+    Read only the top-level metadata of a Jupyter notebook file.
+    
+    With ijson installed the cells (and their potentially large outputs) are
+    streamed past without being materialized. Otherwise the whole notebook
+    is parsed.
+    
+    Args:
+        notebook_path: Path to the .ipynb file.
+        
+    Returns:
+        Notebook metadata, or an empty dict if the notebook has none.
+        
+    Raises:
+        NotebookError: If notebook cannot be read.
+    """
+    if ijson is None:
+        return read_notebook(notebook_path).get("metadata", {})
+    
+    try:
+        with open(notebook_path, 'rb') as f:
+            return next(ijson.items(f, "metadata", use_float=True), {})
+    except FileNotFoundError:
+        raise NotebookError(f"Notebook not found: {notebook_path}")
+    except ijson.JSONError as e:
+        raise NotebookError(f"Invalid notebook JSON: {e}")
+    except Exception as e:
+        raise NotebookError(f"Failed to read notebook: {e}")
+
+
 def write_notebook(notebook_path: Path, notebook_data: dict) -> None:
     """
     Write a Jupyter notebook file.
@@ -77,6 +129,15 @@ def write_notebook(notebook_path: Path, notebook_data: dict) -> None:
         NotebookError: If notebook cannot be written.
     """
     try:
+        # Same bytes as the json path below, so whether the "fast" extra is
+        # installed never shows up as a diff in version control
+        dumped = _orjson_dumps_indented(notebook_data)
+        if dumped is not None:
+            with open(notebook_path, 'wb') as f:
+                f.write(dumped)
+                f.write(b'\n')  # Add trailing newline
+            return
+        
         with open(notebook_path, 'w', encoding='utf-8') as f:
             json.dump(notebook_data, f, indent=2)
             f.write('\n')  # Add trailing newline
@@ -159,11 +220,10 @@ def extract_from_notebook(notebook_path: str) -> Optional[EnvironmentSnapshot]:
     """
     nb_path = Path(notebook_path)
     
-    # Read notebook
-    notebook_data = read_notebook(nb_path)
+    # Read notebook metadata, skipping cells
+    metadata = read_notebook_metadata(nb_path)
     
     # Extract snapshot from metadata
-    metadata = notebook_data.get("metadata", {})
     snapshot_data = metadata.get(METADATA_KEY)
     
     if snapshot_data is None:
@@ -175,7 +235,12 @@ def extract_from_notebook(notebook_path: str) -> Optional[EnvironmentSnapshot]:
         raise NotebookError(f"Invalid embedded snapshot: {e}")
 
 
-def restore_from_nb(notebook_path: Optional[str] = None, dry_run: bool = False) -> None:
+def restore_from_nb(
+    notebook_path: Optional[str] = None,
+    dry_run: bool = False,
+    parallel: Optional[int] = None,
+    force: bool = False,
+) -> None:
     """
     Restore environment from snapshot embedded in notebook metadata.
     
@@ -183,6 +248,9 @@ def restore_from_nb(notebook_path: Optional[str] = None, dry_run: bool = False)
         notebook_path: Optional path to notebook file. If None, attempts to
                       detect automatically (works in some environments).
         dry_run: If True, show what would be installed without actually installing.
+        parallel: Number of concurrent pip processes, or None to decide
+                 automatically. See snapmyenv.restore().
+        force: If True, reinstall packages that are already satisfied.
         
     Raises:
         NotebookError: If notebook operations fail or no snapshot found.
@@ -215,4 +283,4 @@ def restore_from_nb(notebook_path: Optional[str] = None, dry_run: bool = False)
     print(f"Found embedded snapshot in {nb_path.name}")
     
     # Restore from snapshot
-    restore_from_dict(snapshot.to_dict(), dry_run=dry_run)
\ No newline at end of file
+    restore_snapshot(snapshot, dry_run=dry_run, parallel=parallel, force=force)
\ No newline at end of file
@@ -1,14 +1,14 @@
 """Environment restoration functionality."""
 
+import functools
 import sys
-import subprocess
-import tempfile
 import warnings
 import os
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Sequence, Tuple
 
 from .models import EnvironmentSnapshot, Package
-from .capture import get_snapshot, list_snapshots
+from .capture import get_installed_packages, get_snapshot, list_snapshots
+from .store import list_persisted_snapshots
 from .exceptions import RestoreError
 
 
@@ -16,67 +16,407 @@ def check_python_version(snapshot: EnvironmentSnapshot) -> None:
     """
     Check if current Python version matches snapshot.
     
+    Only major.minor is compared: that is what wheel compatibility depends
+    on, so a patch-level difference does not warrant a warning.
+    
     Args:
         snapshot: The environment snapshot to check against.
     """
+    snapshot_version = snapshot.python_version_info
+    if snapshot_version is not None and snapshot_version[:2] == sys.version_info[:2]:
+        return
+    
     current_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+    warnings.warn(
+        f"Python version mismatch!\n"
+        f"  Snapshot: {snapshot.python_version}\n"
+        f"  Current:  {current_version}\n"
+        f"Package installation may fail or produce unexpected results.",
+        UserWarning,
+        stacklevel=2
+    )
+
+
+# Above this many packages, install disjoint shards concurrently first
+PARALLEL_INSTALL_THRESHOLD = 20
+MAX_INSTALL_WORKERS = 4
+
+# Canonical-name prefixes of distributions with very large wheels
+_HEAVY_PACKAGE_PREFIXES = (
+    "jaxlib",
+    "llvmlite",
+    "nvidia-",
+    "opencv-",
+    "pandas",
+    "pyarrow",
+    "scipy",
+    "tensorflow",
+    "torch",
+    "triton",
+    "xgboost",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _pip_command() -> Tuple[str, ...]:
+    """
+    Get the command that runs pip for the current interpreter.
     
-    if current_version != snapshot.python_version:
-        warnings.warn(
-            f"Python version mismatch!\n"
-            f"  Snapshot: {snapshot.python_version}\n"
-            f"  Current:  {current_version}\n"
-            f"Package installation may fail or produce unexpected results.",
-            UserWarning,
-            stacklevel=2
-        )
+    Prefers the pip entry-point script installed next to this interpreter,
+    which skips the runpy lookup of "python -m pip". Only the interpreter's
+    own scripts directory is searched, and the script must be bound to
+    sys.executable, so a pip belonging to another Python is never used.
+    
+    Returns:
+        Command prefix, e.g. ("/venv/bin/pip",) or (sys.executable, "-m", "pip").
+    """
+    import shutil
+    import sysconfig
+    
+    pip_script = shutil.which("pip", path=sysconfig.get_path("scripts"))
+    if pip_script is not None and _script_uses_this_interpreter(pip_script):
+        return (pip_script,)
+    return (sys.executable, "-m", "pip")
+
+
+def _script_uses_this_interpreter(script: str) -> bool:
+    """
+    Check that an entry-point script's shebang points at sys.executable.
+    
+    System-wide scripts directories (e.g. /usr/bin) can hold a pip for a
+    different Python version than the one running snapmyenv.
+    """
+    try:
+        with open(script, "rb") as f:
+            first_line = f.readline(1024)
+    except OSError:
+        return False
+    
+    if not first_line.startswith(b"#!"):
+        # Windows .exe launchers carry no shebang; their scripts dir is per-install
+        return os.name == "nt"
+    
+    parts = first_line[2:].split()
+    if not parts:
+        return False
+    interpreter = os.fsdecode(parts[0])
+    return os.path.realpath(interpreter) == os.path.realpath(sys.executable)
+
+
+def _pip_cache_args() -> List[str]:
+    """
+    Get pip arguments selecting the wheel cache for restores.
+    
+    Set SNAPMYENV_CACHE to a directory that outlives the runtime (e.g. a
+    mounted Google Drive folder) so downloaded wheels are reused across
+    restores. Unset, pip's own cache configuration applies.
+    """
+    cache_dir = os.environ.get("SNAPMYENV_CACHE")
+    if not cache_dir:
+        return []
+    return ["--cache-dir", cache_dir]
+
+
+# Environment defaults for pip: skip the PyPI self-version check (an HTTP
+# request per process) and never block on an interactive prompt
+_PIP_ENV_DEFAULTS = {
+    "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+    "PIP_NO_INPUT": "1",
+}
+
+
+# pip output lines worth relaying while an install is running
+_PROGRESS_PREFIXES = (b"Collecting ", b"Installing collected packages", b"Successfully installed")
+
+
+def _kill_process_tree(proc) -> None:
+    """Kill a pip process and any build subprocesses it started."""
+    import signal
+    
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass  # Already exited
+
+
+def _run_pip_install(
+    requirements: List[str],
+    extra_args: Sequence[str] = (),
+    on_progress: Optional[Callable[[str], None]] = None,
+    on_start: Optional[Callable[[Any], None]] = None,
+):
+    """
+    Run a single pip install over a list of requirement specifiers.
+    
+    Args:
+        requirements: Specifiers such as "numpy==1.24.0".
+        extra_args: Additional arguments for pip install.
+        on_progress: Optional callback, called from this thread with each
+                    progress line as pip prints it. Other output is dropped.
+        on_start: Optional callback, called with the pip Popen object as soon
+                 as it starts, so another thread can kill it.
+        
+    Returns:
+        The completed pip process, with stderr captured as undecoded bytes.
+        
+    Raises:
+        subprocess.TimeoutExpired: If pip does not finish in time.
+    """
+    import subprocess
+    import tempfile
+    import threading
+    
+    # Requirements go through a file rather than argv to avoid command line
+    # length limits. Where available, /dev/stdin lets pip read them straight
+    # from a pipe, so nothing touches the disk.
+    requirements_text = "\n".join(requirements)
+    tmp_req_path = None
+    if os.path.exists("/dev/stdin"):
+        req_file, pip_input = "/dev/stdin", requirements_text.encode()
+    else:
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as tmp_req:
+            tmp_req.write(requirements_text)
+            tmp_req_path = tmp_req.name
+        req_file, pip_input = tmp_req_path, None
+
+    cmd = [*_pip_command(), "install", *_pip_cache_args(), *extra_args, "-r", req_file]
+    # Timeout scaled by number of packages (30s per package avg)
+    timeout = 30 + (10 * len(requirements))
+    
+    try:
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if pip_input is None else subprocess.PIPE,
+            stdout=subprocess.DEVNULL if on_progress is None else subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            # Built per call so variables set later in the session still apply
+            env={**_PIP_ENV_DEFAULTS, **os.environ},
+            # Own process group, so build subprocesses holding our pipes die too
+            start_new_session=hasattr(os, "killpg"),
+        ) as proc:
+            if on_start is not None:
+                on_start(proc)
+            
+            # Kill pip as soon as its budget runs out, even mid-line
+            timed_out = threading.Event()
+            
+            def kill() -> None:
+                timed_out.set()
+                _kill_process_tree(proc)
+            
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            
+            # Drain stderr in the background so pip never blocks on it
+            stderr_chunks = []
+            stderr_reader = threading.Thread(
+                target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True
+            )
+            stderr_reader.start()
+            
+            try:
+                if pip_input is not None:
+                    try:
+                        proc.stdin.write(pip_input)
+                        proc.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                
+                if on_progress is not None:
+                    for line in proc.stdout:
+                        if line.startswith(_PROGRESS_PREFIXES):
+                            on_progress(line.decode(errors="replace").rstrip())
+                
+                proc.wait()
+                stderr_reader.join()
+            except BaseException:
+                # e.g. KeyboardInterrupt: don't leave pip running detached
+                _kill_process_tree(proc)
+                raise
+            finally:
+                timer.cancel()
+            
+            # The timer can fire just after pip exits on its own; a clean exit
+            # means pip finished in time
+            if timed_out.is_set() and proc.returncode != 0:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            return subprocess.CompletedProcess(cmd, proc.returncode, None, b"".join(stderr_chunks))
+    finally:
+        # Clean up temp file
+        if tmp_req_path is not None and os.path.exists(tmp_req_path):
+            os.unlink(tmp_req_path)
+
+
+def _install_shards(requirements: List[str], workers: int) -> None:
+    """
+    Install requirements as concurrent, disjoint pip processes.
+    
+    Shards use --no-deps so the pip processes never compete over the same
+    distribution. Failures are only warned about: the caller follows up with
+    a full install that resolves dependencies and retries anything missed.
+    
+    Args:
+        requirements: Specifiers such as "numpy==1.24.0".
+        workers: Number of shards, and of concurrent pip processes.
+    """
+    import queue
+    import subprocess
+    import threading
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    
+    # Workers only enqueue progress; this thread prints, so lines never interleave
+    progress: "queue.Queue[str]" = queue.Queue()
+    
+    # Shard pips run in their own process groups and so never see Ctrl+C;
+    # this thread kills them itself when it is interrupted
+    processes_lock = threading.Lock()
+    processes = []
+    interrupted = threading.Event()
+    
+    def track(proc) -> None:
+        with processes_lock:
+            processes.append(proc)
+            if interrupted.is_set():
+                _kill_process_tree(proc)
+    
+    def install_shard(shard: List[str]) -> bool:
+        try:
+            result = _run_pip_install(shard, ["--no-deps"], progress.put, track)
+        except subprocess.TimeoutExpired:
+            warnings.warn("Timeout during parallel shard installation")
+            return False
+        if interrupted.is_set():
+            return False
+        if result.returncode != 0:
+            stderr = result.stderr.decode(errors="replace")
+            warnings.warn(f"Parallel shard installation failed: {stderr}")
+            return False
+        return True
+    
+    def print_progress() -> None:
+        while True:
+            try:
+                print(f"    {progress.get_nowait()}")
+            except queue.Empty:
+                return
+    
+    shards = [requirements[i::workers] for i in range(workers)]
+    print(f"  Running pip install in {workers} parallel shards...")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(install_shard, shard): shard for shard in shards}
+        pending = set(futures)
+        finished = 0
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                print_progress()
+                for future in done:
+                    finished += 1
+                    status = "✓" if future.result() else "✗"
+                    print(f"  [{finished}/{workers}] {len(futures[future])} packages {status}")
+        except BaseException:
+            # e.g. KeyboardInterrupt: stop every shard so the executor's
+            # shutdown does not wait for them to finish on their own
+            with processes_lock:
+                interrupted.set()
+                for proc in processes:
+                    _kill_process_tree(proc)
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def filter_satisfied_packages(packages: List[Package]) -> List[Package]:
+    """
+    Drop packages that are already installed at the requested version.
+    
+    Args:
+        packages: Packages requested by a snapshot.
+        
+    Returns:
+        Packages that still need to be installed, in their original order.
+    """
+    installed = {pkg.canonical_name: pkg.version for pkg in get_installed_packages()}
+    return [pkg for pkg in packages if installed.get(pkg.canonical_name) != pkg.version]
 
 
-def batch_install_packages(packages: List[Package], dry_run: bool = False) -> bool:
+def batch_install_packages(
+    packages: List[Package],
+    dry_run: bool = False,
+    parallel: Optional[int] = None,
+    force: bool = False,
+) -> bool:
     """
     Install multiple packages in a single pip call for performance.
     
+    Large package lists are first installed in parallel shards, then a
+    final pip call over the full list resolves anything still missing.
+    
     Args:
         packages: List of packages to install.
         dry_run: If True, only print what would be installed.
+        parallel: Number of concurrent pip processes. If None, lists longer
+                 than PARALLEL_INSTALL_THRESHOLD use up to MAX_INSTALL_WORKERS;
+                 1 always installs serially.
+        force: If True, pass --force-reinstall so packages are reinstalled
+              even if the pinned version is already installed. Forced
+              installs always run serially, whatever parallel says.
         
     Returns:
         True if installation succeeded, False otherwise.
     """
     if not packages:
         return True
-
+    
     # Prepare requirements content
-    requirements = [f"{pkg.name}=={pkg.version}" for pkg in packages]
+    requirements = [pkg.spec for pkg in packages]
     
     if dry_run:
-        print("  [DRY RUN] Would install the following packages:")
-        for req in requirements:
-            print(f"    {req}")
+        # One write for the whole list rather than one per package
+        sys.stdout.write(
+            "  [DRY RUN] Would install the following packages:\n"
+            + "".join(f"    {req}\n" for req in requirements)
+        )
         return True
     
-    # Use a temporary file to avoid command line length limits
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as tmp_req:
-        tmp_req.write("\n".join(requirements))
-        tmp_req_path = tmp_req.name
-
+    import subprocess
+    
+    workers = parallel
+    if force:
+        # Reinstalls uninstall first; concurrent pips would race over the
+        # same site-packages files, so they always run serially
+        workers = 1
+    elif workers is None:
+        if len(requirements) > PARALLEL_INSTALL_THRESHOLD:
+            workers = min(MAX_INSTALL_WORKERS, os.cpu_count() or 1)
+        else:
+            workers = 1
+    workers = min(workers, len(requirements))
+    force_args = ["--force-reinstall"] if force else []
+    
     try:
+        if workers > 1:
+            # Heavy wheels first: round-robin sharding then spreads them across
+            # shards instead of leaving one shard to finish them all
+            by_weight = sorted(
+                packages,
+                key=lambda pkg: pkg.canonical_name.startswith(_HEAVY_PACKAGE_PREFIXES),
+                reverse=True,
+            )
+            shard_requirements = [pkg.spec for pkg in by_weight]
+            _install_shards(shard_requirements, workers)
+        
         print("  Running pip install...")
-        # Run pip install -r temp_file
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", tmp_req_path],
-            capture_output=True,
-            text=True,
-            # Timeout scaled by number of packages (30s per package avg)
-            timeout=30 + (10 * len(packages)), 
-        )
+        result = _run_pip_install(requirements, force_args, lambda line: print(f"    {line}"))
         
         if result.returncode == 0:
             return True
         else:
             # If batch install fails, we warn and provide output
-            warnings.warn(f"Batch installation failed: {result.stderr}")
-            print(f"Stdout: {result.stdout}")
+            stderr = result.stderr.decode(errors="replace")
+            warnings.warn(f"Batch installation failed: {stderr}")
             return False
             
     except subprocess.TimeoutExpired:
@@ -85,20 +425,30 @@ def batch_install_packages(packages: List[Package], dry_run: bool = False) -> bo
     except Exception as e:
         warnings.warn(f"Error during batch installation: {e}")
         return False
-    finally:
-        # Clean up temp file
-        if os.path.exists(tmp_req_path):
-            os.unlink(tmp_req_path)
 
 
-def restore_snapshot(snapshot: EnvironmentSnapshot, dry_run: bool = False) -> None:
+def restore_snapshot(
+    snapshot: EnvironmentSnapshot,
+    dry_run: bool = False,
+    parallel: Optional[int] = None,
+    force: bool = False,
+) -> None:
     """
     Internal logic to restore a specific snapshot object.
     
     Args:
         snapshot: The snapshot object to restore.
         dry_run: If True, preview changes only.
+        parallel: Number of concurrent pip processes, or None to decide
+                 automatically from the number of packages.
+        force: If True, reinstall packages that are already satisfied.
+        
+    Raises:
+        RestoreError: If parallel is less than 1 or installation fails.
     """
+    if parallel is not None and parallel < 1:
+        raise RestoreError("parallel must be at least 1")
+    
     print(f"{'[DRY RUN] ' if dry_run else ''}Restoring environment '{snapshot.name}'")
     print(snapshot.format_summary())
     print()
@@ -106,34 +456,75 @@ def restore_snapshot(snapshot: EnvironmentSnapshot, dry_run: bool = False) -> No
     # Check Python version
     check_python_version(snapshot)
     
-    total = len(snapshot.packages)
+    if not snapshot.packages:
+        print("✓ No packages to restore")
+        return
+    
+    # Duplicate names (e.g. from merged snapshots) would make pip reject
+    # the whole requirements list. The first entry for a name wins, as in
+    # get_package() and in import-path shadowing.
+    first_by_name = {}
+    for pkg in snapshot.packages:
+        first_by_name.setdefault(pkg.canonical_name, pkg)
+    packages = list(first_by_name.values())
+    if len(packages) < len(snapshot.packages):
+        warnings.warn(
+            f"Snapshot lists {len(snapshot.packages) - len(packages)} duplicate "
+            f"package entries; using the first version given for each.",
+            UserWarning,
+            stacklevel=2
+        )
+    
+    # Re-running a restore should not make pip re-check every package
+    pending = packages if force else filter_satisfied_packages(packages)
+    skipped = len(packages) - len(pending)
+    if skipped:
+        print(f"  Skipping {skipped} already-satisfied packages")
     
     if dry_run:
-        print(f"Processing {total} packages...")
-    else:
-        print(f"Installing {total} packages (this may take a moment)...")
+        print(f"Processing {len(pending)} packages...")
+    elif pending:
+        print(f"Installing {len(pending)} packages (this may take a moment)...")
     
     # Perform batch installation
-    success = batch_install_packages(snapshot.packages, dry_run=dry_run)
+    success = batch_install_packages(
+        pending, dry_run=dry_run, parallel=parallel, force=force
+    )
     
     print()
     if dry_run:
-        print(f"✓ Dry run complete: {total} packages processed")
+        print(
+            f"✓ Dry run complete: {len(pending)} packages to install, "
+            f"{skipped} already satisfied"
+        )
     else:
         if success:
-            print(f"✓ Restoration complete: {total} packages installed successfully.")
+            print(
+                f"✓ Restoration complete: {len(pending)} packages installed, "
+                f"{skipped} already satisfied."
+            )
         else:
             print("✗ Restoration failed. Check warnings above.")
             raise RestoreError("Failed to install packages.")
 
 
-def restore(name: str = "default", dry_run: bool = False) -> None:
+def restore(
+    name: str = "default",
+    dry_run: bool = False,
+    parallel: Optional[int] = None,
+    force: bool = False,
+) -> None:
     """
     Restore environment from a previously captured snapshot in the session.
     
     Args:
         name: Name of the snapshot to restore (default: "default").
         dry_run: If True, show what would be installed without actually installing.
+        parallel: Number of concurrent pip processes. If None (default), large
+                 snapshots are installed in parallel automatically; pass 1 to
+                 force a single serial pip call.
+        force: If True, reinstall every package even if the pinned version
+              is already installed. By default such packages are skipped.
         
     Raises:
         RestoreError: If snapshot not found or restoration fails.
@@ -142,21 +533,31 @@ def restore(name: str = "default", dry_run: bool = False) -> None:
     snapshot = get_snapshot(name)
     
     if snapshot is None:
+        # get_snapshot() also looked in the disk cache, so list both
+        available = list(dict.fromkeys([*list_snapshots(), *list_persisted_snapshots()]))
         raise RestoreError(
-            f"Snapshot '{name}' not found. "
-            f"Available snapshots: {', '.join(get_snapshot_names()) or 'none'}"
+            f"Snapshot '{name}' not found in this session or the disk cache. "
+            f"Available snapshots: {', '.join(available) or 'none'}"
         )
     
-    restore_snapshot(snapshot, dry_run=dry_run)
+    restore_snapshot(snapshot, dry_run=dry_run, parallel=parallel, force=force)
 
 
-def restore_from_dict(snapshot_dict: dict, dry_run: bool = False) -> None:
+def restore_from_dict(
+    snapshot_dict: dict,
+    dry_run: bool = False,
+    parallel: Optional[int] = None,
+    force: bool = False,
+) -> None:
     """
     Restore environment from a snapshot dictionary.
     
     Args:
         snapshot_dict: Dictionary representation of a snapshot.
         dry_run: If True, show what would be installed without actually installing.
+        parallel: Number of concurrent pip processes, or None to decide
+                 automatically. See restore().
+        force: If True, reinstall packages that are already satisfied.
         
     Raises:
         RestoreError: If snapshot is invalid or restoration fails.
@@ -166,14 +567,5 @@ def restore_from_dict(snapshot_dict: dict, dry_run: bool = False) -> None:
     except Exception as e:
         raise RestoreError(f"Invalid snapshot data: {e}")
     
-    restore_snapshot(snapshot, dry_run=dry_run)
+    restore_snapshot(snapshot, dry_run=dry_run, parallel=parallel, force=force)
 
-
-def get_snapshot_names() -> List[str]:
-    """
-    Get list of available snapshot names.
-    
-    Returns:
-        List of snapshot names.
-    """
-    return list_snapshots()
\ No newline at end of file
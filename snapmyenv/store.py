@@ -0,0 +1,255 @@
+"""Snapshot storage: bounded in-memory session store and on-disk cache."""
+
+import atexit
+import os
+import sys
+import warnings
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote, unquote
+
+from .models import EnvironmentSnapshot
+
+
+class SnapshotStore(MutableMapping):
+    """
+    Mapping of snapshot names to snapshots with a bounded memory footprint.
+
+    Only the most recently used snapshots are kept in memory. Older ones are
+    written to a private temporary directory as JSON and loaded back on
+    access, so long-running sessions that capture many snapshots stay small.
+    """
+
+    def __init__(self, max_in_memory: int = 4, spill_dir: Optional[Path] = None):
+        """
+        Args:
+            max_in_memory: Number of snapshots to keep in memory.
+            spill_dir: Directory for spilled snapshots. If None, a temporary
+                      directory is created on first spill and removed at exit.
+        """
+        self.max_in_memory = max_in_memory
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self._memory: "OrderedDict[str, EnvironmentSnapshot]" = OrderedDict()
+        self._spilled: Dict[str, Path] = {}
+        # All names in insertion order, wherever the snapshot currently lives
+        self._names: Dict[str, None] = {}
+
+    def __getitem__(self, name: str) -> EnvironmentSnapshot:
+        if name in self._memory:
+            self._memory.move_to_end(name)
+            return self._memory[name]
+        if name not in self._spilled:
+            raise KeyError(name)
+
+        path = self._spilled[name]
+        try:
+            snapshot = EnvironmentSnapshot.from_json(path.read_text(encoding="utf-8"), trusted=True)
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            # Spill file removed (e.g. by tmp cleanup) or corrupt; forget the
+            # name entirely so the store stays consistent
+            del self._spilled[name]
+            del self._names[name]
+            self._unlink(path)
+            warnings.warn(f"Dropping snapshot '{name}': its spilled copy could not be read: {e}")
+            raise KeyError(name) from None
+        del self._spilled[name]
+        self._unlink(path)
+        self._memory[name] = snapshot
+        self._evict()
+        return snapshot
+
+    def __setitem__(self, name: str, snapshot: EnvironmentSnapshot) -> None:
+        path = self._spilled.pop(name, None)
+        if path is not None:
+            self._unlink(path)
+        self._memory[name] = snapshot
+        self._memory.move_to_end(name)
+        self._names[name] = None
+        self._evict()
+
+    def __delitem__(self, name: str) -> None:
+        del self._names[name]
+        if self._memory.pop(name, None) is None:
+            self._unlink(self._spilled.pop(name))
+
+    def __contains__(self, name: object) -> bool:
+        # The inherited version goes through __getitem__, which would load
+        # spilled snapshots and reorder the LRU
+        return name in self._names
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def clear(self) -> None:
+        """Remove all snapshots, including spilled files."""
+        for path in self._spilled.values():
+            self._unlink(path)
+        self._memory.clear()
+        self._spilled.clear()
+        self._names.clear()
+
+    def _get_spill_dir(self) -> Path:
+        """Return the spill directory, creating it if needed."""
+        if self._spill_dir is None:
+            import shutil
+            import tempfile
+            
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="snapmyenv-"))
+            atexit.register(shutil.rmtree, self._spill_dir, True)
+        else:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+        return self._spill_dir
+
+    def _evict(self) -> None:
+        """Spill least recently used snapshots until memory is within bounds."""
+        excess = len(self._memory) - self.max_in_memory
+        # Oldest first; a snapshot that can't be spilled stays in memory and
+        # the next-oldest is tried instead
+        for name in list(self._memory):
+            if excess <= 0:
+                return
+            path = None
+            try:
+                path = self._get_spill_dir() / f"{quote(name, safe='')}.json"
+                path.write_text(self._memory[name].to_json(), encoding="utf-8")
+            except (OSError, TypeError, ValueError):
+                # Unwritable, or metadata that isn't JSON-serializable
+                if path is not None:
+                    self._unlink(path)
+                continue
+            del self._memory[name]
+            self._spilled[name] = path
+            excess -= 1
+    
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        """Remove a spill file, ignoring one that is already gone."""
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def get_snapmyenv_home() -> Path:
+    """
+    Get the directory for snapmyenv's persistent data.
+    
+    Returns:
+        $SNAPMYENV_HOME if set, otherwise ~/.snapmyenv.
+    """
+    return Path(os.environ.get("SNAPMYENV_HOME") or Path.home() / ".snapmyenv")
+
+
+def _persisted_dir() -> Path:
+    """
+    Get the on-disk cache directory for the running environment.
+    
+    The directory is keyed by the interpreter's major.minor version, the
+    machine architecture and a hash of sys.prefix, so snapshots saved from
+    another interpreter, virtualenv or project are never picked up.
+    """
+    import hashlib
+    import platform
+    
+    prefix_hash = hashlib.sha256(os.fsencode(sys.prefix)).hexdigest()[:12]
+    key = f"py{sys.version_info.major}.{sys.version_info.minor}-{platform.machine()}-{prefix_hash}"
+    return get_snapmyenv_home() / "snapshots" / key
+
+
+def _persisted_path(name: str) -> Path:
+    """Get the on-disk cache path for a snapshot name."""
+    return _persisted_dir() / f"{quote(name, safe='')}.json"
+
+
+def persist_snapshot(snapshot: EnvironmentSnapshot) -> None:
+    """
+    Write a snapshot to the on-disk cache so later sessions can restore it.
+    
+    The cache is best effort: failures are reported as warnings.
+    
+    Args:
+        snapshot: The snapshot to save under its own name.
+    """
+    path = _persisted_path(snapshot.name)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(snapshot.to_json(), encoding="utf-8")
+        # Atomic, so concurrent sessions never see a half-written file
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        # TypeError/ValueError: metadata that JSON can't represent
+        warnings.warn(f"Could not cache snapshot '{snapshot.name}' on disk: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def load_persisted_snapshot(name: str) -> Optional[EnvironmentSnapshot]:
+    """
+    Load a snapshot saved by persist_snapshot() in an earlier session.
+    
+    Args:
+        name: Name of the snapshot.
+        
+    Returns:
+        EnvironmentSnapshot, or None if no usable cached copy exists.
+    """
+    path = _persisted_path(name)
+    try:
+        # Validated: files under SNAPMYENV_HOME can be edited or truncated
+        return EnvironmentSnapshot.from_json(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        warnings.warn(f"Ignoring unreadable cached snapshot {path}: {e}")
+        return None
+
+
+def list_persisted_snapshots() -> List[str]:
+    """
+    List the names of snapshots in this environment's on-disk cache.
+    
+    Returns:
+        Snapshot names, sorted.
+    """
+    try:
+        return sorted(unquote(path.stem) for path in _persisted_dir().glob("*.json"))
+    except OSError:
+        return []
+
+
+def delete_persisted_snapshot(name: str) -> bool:
+    """
+    Remove a snapshot from the on-disk cache.
+    
+    Args:
+        name: Name of the snapshot.
+        
+    Returns:
+        True if a cached copy was removed.
+    """
+    try:
+        _persisted_path(name).unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def clear_persisted_snapshots() -> None:
+    """Remove every cached snapshot of the running environment from disk."""
+    try:
+        paths = list(_persisted_dir().glob("*.json"))
+    except OSError:
+        return
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,26 @@
+"""Shared pytest fixtures for snapmyenv tests."""
+
+import importlib
+
+import pytest
+
+capture_module = importlib.import_module("snapmyenv.capture")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path, monkeypatch):
+    """Keep the on-disk snapshot cache out of the real home directory."""
+    monkeypatch.setenv("SNAPMYENV_HOME", str(tmp_path / "snapmyenv-home"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_snapshots():
+    """
+    Start every test with an empty session store.
+    
+    Unlike clear_snapshots(), this keeps the cached package enumeration,
+    so tests that capture an unchanged environment don't rescan it.
+    """
+    capture_module._SNAPSHOTS.clear()
+    yield
+    capture_module._SNAPSHOTS.clear()
@@ -1,17 +1,26 @@
 """Tests for snapmyenv.capture module."""
 
+import importlib
+import sys
+
 import pytest
-from snapmyenv.capture import capture, get_snapshot, list_snapshots, clear_snapshots
+from snapmyenv.capture import (
+    capture,
+    clear_snapshots,
+    delete_snapshot,
+    get_snapshot,
+    list_snapshots,
+)
 from snapmyenv.exceptions import CaptureError
+from snapmyenv.models import Package
+
+# The package re-exports capture(), which shadows the submodule attribute
+capture_module = importlib.import_module("snapmyenv.capture")
 
 
 class TestCapture:
     """Tests for capture functionality."""
     
-    def setup_method(self):
-        """Clear snapshots before each test."""
-        clear_snapshots()
-    
     def test_capture_basic(self):
         """Test basic environment capture."""
         snapshot_dict = capture("test")
@@ -78,6 +87,11 @@ class TestCapture:
         
         clear_snapshots()
         assert list_snapshots() == []
+        
+        # The disk cache is only cleared on request
+        assert get_snapshot("test1") is not None
+        clear_snapshots(persisted=True)
+        assert get_snapshot("test1") is None
     
     def test_capture_overwrites_existing(self):
         """Test that capturing with same name overwrites."""
@@ -86,4 +100,67 @@ class TestCapture:
         
         # Should only have one snapshot with this name
         snapshots = list_snapshots()
-        assert snapshots.count("test") == 1
\ No newline at end of file
+        assert snapshots.count("test") == 1
+
+    def test_capture_reuses_unchanged_environment(self, monkeypatch):
+        """Test that recapturing an unchanged environment skips enumeration."""
+        first = capture("first")
+        
+        def fail():
+            raise AssertionError("packages should not be re-enumerated")
+        
+        monkeypatch.setattr(capture_module, "get_installed_packages", fail)
+        second = capture("second", metadata={"run": "2"})
+        
+        assert second["name"] == "second"
+        assert second["metadata"] == {"run": "2"}
+        assert second["packages"] == first["packages"]
+        assert get_snapshot("first").name == "first"
+    
+    def test_capture_detects_changed_environment(self, monkeypatch):
+        """Test that a changed import path triggers re-enumeration."""
+        capture("first")
+        
+        monkeypatch.setattr(capture_module, "_environment_fingerprint", lambda: ("changed",))
+        monkeypatch.setattr(
+            capture_module,
+            "get_installed_packages",
+            lambda: [Package(name="only", version="1.0")],
+        )
+        snapshot_dict = capture("second")
+        
+        assert snapshot_dict["packages"] == [{"name": "only", "version": "1.0"}]
+    
+    def test_snapshot_survives_session(self, capsys):
+        """Test that captured snapshots are found again after the session ends."""
+        capture("persisted")
+        clear_snapshots()  # As in a new session
+        
+        snapshot = get_snapshot("persisted")
+        assert snapshot is not None
+        assert snapshot.name == "persisted"
+        assert list_snapshots() == ["persisted"]
+        assert "from the disk cache" in capsys.readouterr().out
+    
+    def test_persisted_snapshot_is_per_environment(self, monkeypatch):
+        """Test that another virtualenv's cached snapshot is not picked up."""
+        capture("default")
+        capture_module._SNAPSHOTS.clear()
+        
+        monkeypatch.setattr(sys, "prefix", "/some/other/venv")
+        assert get_snapshot("default") is None
+    
+    def test_delete_snapshot(self):
+        """Test deleting a snapshot from the session and the disk cache."""
+        capture("gone")
+        
+        assert delete_snapshot("gone") is True
+        assert get_snapshot("gone") is None
+        assert delete_snapshot("gone") is False
+    
+    def test_capture_with_unserializable_metadata(self):
+        """Test that metadata JSON can't hold only skips the disk cache."""
+        with pytest.warns(UserWarning, match="Could not cache"):
+            capture("odd", metadata={"n": {1, 2}})
+        
+        assert get_snapshot("odd").metadata == {"n": {1, 2}}
@@ -1,5 +1,8 @@
 """Tests for snapmyenv.models module."""
 
+import json
+from dataclasses import asdict, replace
+
 import pytest
 from snapmyenv.models import Package, EnvironmentSnapshot
 
@@ -21,6 +24,11 @@ class TestPackage:
         with pytest.raises(ValueError, match="version cannot be empty"):
             Package(name="numpy", version="")
     
+    def test_package_spec(self):
+        """Test pinned requirement specifier."""
+        pkg = Package(name="numpy", version="1.24.0")
+        assert pkg.spec == "numpy==1.24.0"
+    
     def test_package_to_dict(self):
         """Test package serialization to dict."""
         pkg = Package(name="pandas", version="2.0.0")
@@ -28,6 +36,14 @@ class TestPackage:
         
         assert data == {"name": "pandas", "version": "2.0.0"}
     
+    def test_package_canonical_name(self):
+        """Test PEP 503 name normalization."""
+        pkg = Package(name="Typing_Extensions", version="4.0.0")
+        assert pkg.canonical_name == "typing-extensions"
+        
+        pkg = Package.from_dict_unchecked({"name": "zope.Interface", "version": "5.0"})
+        assert pkg.canonical_name == "zope-interface"
+    
     def test_package_from_dict(self):
         """Test package deserialization from dict."""
         data = {"name": "requests", "version": "2.28.0"}
@@ -201,9 +217,29 @@ class TestEnvironmentSnapshot:
         assert pkg is not None
         assert pkg.name == "pandas"
         
+        # Separator insensitive (PEP 503)
+        snapshot = replace(snapshot, packages=[Package(name="typing_extensions", version="4.0.0")])
+        pkg = snapshot.get_package("Typing.Extensions")
+        assert pkg is not None
+        assert pkg.name == "typing_extensions"
+        
         # Not found
         pkg = snapshot.get_package("nonexistent")
         assert pkg is None
+        
+        # Packages added after the first lookup are found
+        snapshot.packages.append(Package(name="scipy", version="1.11.0"))
+        assert snapshot.get_package("scipy").version == "1.11.0"
+        snapshot.packages = [Package(name="numpy", version="2.0.0")]
+        assert snapshot.get_package("numpy").version == "2.0.0"
+        snapshot.packages[0] = Package(name="numpy", version="2.1.0")
+        assert snapshot.get_package("numpy").version == "2.1.0"
+        snapshot.packages[0] = Package(name="pandas", version="2.2.0")
+        assert snapshot.get_package("pandas").version == "2.2.0"
+        assert snapshot.get_package("numpy") is None
+        
+        # The lookup index is not part of the dataclass
+        assert "_index" not in asdict(snapshot)
     
     def test_format_summary(self):
         """Test formatting snapshot summary."""
@@ -227,4 +263,45 @@ class TestEnvironmentSnapshot:
         assert "3.10.0" in summary
         assert "Linux" in summary
         assert "Yes" in summary  # Colab
-        assert "1" in summary  # Package count
\ No newline at end of file
+        assert "1" in summary  # Package count
+
+    def test_snapshot_from_dict_trusted(self):
+        """Test trusted deserialization skips package validation."""
+        data = {
+            "name": "test",
+            "python_version": "3.10.0",
+            "platform_system": "Linux",
+            "platform_release": "5.15.0",
+            "platform_machine": "x86_64",
+            "is_colab": False,
+            "packages": [{"name": "numpy", "version": ""}],
+            "timestamp": "2024-01-01T00:00:00Z",
+            "snapmyenv_version": "0.1.0",
+        }
+        
+        with pytest.raises(ValueError, match="version cannot be empty"):
+            EnvironmentSnapshot.from_dict(data)
+        
+        snapshot = EnvironmentSnapshot.from_dict(data, trusted=True)
+        assert snapshot.packages[0] == Package.from_dict_unchecked({"name": "numpy", "version": ""})
+    
+    def test_snapshot_from_json_validates_by_default(self):
+        """Test from_json only skips validation when asked to."""
+        data = {
+            "name": "test",
+            "python_version": "3.10.0",
+            "platform_system": "Linux",
+            "platform_release": "5.15.0",
+            "platform_machine": "x86_64",
+            "is_colab": False,
+            "packages": [{"name": "numpy", "version": ""}],
+            "timestamp": "2024-01-01T00:00:00Z",
+            "snapmyenv_version": "0.1.0",
+        }
+        json_str = json.dumps(data)
+        
+        with pytest.raises(ValueError, match="version cannot be empty"):
+            EnvironmentSnapshot.from_json(json_str)
+        
+        snapshot = EnvironmentSnapshot.from_json(json_str, trusted=True)
+        assert snapshot.packages[0].version == ""
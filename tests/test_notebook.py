@@ -0,0 +1,101 @@
+"""Tests for snapmyenv.notebook module."""
+
+import json
+
+import pytest
+from snapmyenv.capture import capture
+from snapmyenv.notebook import (
+    embed,
+    extract_from_notebook,
+    read_notebook,
+    restore_from_nb,
+    write_notebook,
+    METADATA_KEY,
+)
+from snapmyenv.exceptions import NotebookError
+
+
+def write_ipynb(path, metadata=None):
+    """Write a minimal notebook with one output-heavy cell."""
+    notebook = {
+        "cells": [
+            {
+                "cell_type": "code",
+                "metadata": {},
+                "source": ["print('hi')"],
+                "outputs": [{"output_type": "display_data", "data": {"image/png": "A" * 10000}}],
+                "execution_count": 1,
+            }
+        ],
+        "metadata": metadata or {},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    path.write_text(json.dumps(notebook), encoding="utf-8")
+
+
+class TestNotebook:
+    """Tests for notebook embedding and extraction."""
+
+    def test_embed_and_extract_roundtrip(self, tmp_path):
+        """Test embedding a snapshot and extracting it again."""
+        nb_path = tmp_path / "analysis.ipynb"
+        write_ipynb(nb_path, metadata={"kernelspec": {"name": "python3"}})
+
+        captured = capture("nb")
+        embed("nb", str(nb_path))
+
+        notebook_data = read_notebook(nb_path)
+        assert notebook_data["metadata"]["kernelspec"] == {"name": "python3"}
+        assert notebook_data["metadata"][METADATA_KEY]["name"] == "nb"
+        assert len(notebook_data["cells"]) == 1
+
+        snapshot = extract_from_notebook(str(nb_path))
+        assert snapshot is not None
+        assert snapshot.name == "nb"
+        assert len(snapshot.packages) == len(captured["packages"])
+
+    def test_extract_without_snapshot(self, tmp_path):
+        """Test extracting from a notebook with no embedded snapshot."""
+        nb_path = tmp_path / "plain.ipynb"
+        write_ipynb(nb_path)
+
+        assert extract_from_notebook(str(nb_path)) is None
+
+    def test_extract_invalid_json(self, tmp_path):
+        """Test extracting from a corrupt notebook file."""
+        nb_path = tmp_path / "broken.ipynb"
+        nb_path.write_text('{"cells": [', encoding="utf-8")
+
+        with pytest.raises(NotebookError):
+            extract_from_notebook(str(nb_path))
+
+    def test_restore_from_nb_dry_run(self, tmp_path, capsys):
+        """Test restoring from an embedded snapshot in dry-run mode."""
+        nb_path = tmp_path / "analysis.ipynb"
+        write_ipynb(nb_path)
+
+        capture("nb")
+        embed("nb", str(nb_path))
+        restore_from_nb(str(nb_path), dry_run=True)
+
+        output = capsys.readouterr().out
+        assert "Found embedded snapshot" in output
+        assert "Dry run complete" in output
+    
+    def test_write_notebook_matches_json_output(self, tmp_path):
+        """Test that written notebooks don't depend on orjson being installed."""
+        nb_path = tmp_path / "unicode.ipynb"
+        notebook = {
+            "cells": [{"cell_type": "markdown", "metadata": {}, "source": ["Café ✓"]}],
+            "metadata": {"kernelspec": {"name": "python3"}},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+        
+        write_notebook(nb_path, notebook)
+        assert nb_path.read_text(encoding="utf-8") == json.dumps(notebook, indent=2) + "\n"
+        
+        notebook["cells"][0]["source"] = ["plain"]
+        write_notebook(nb_path, notebook)
+        assert nb_path.read_text(encoding="utf-8") == json.dumps(notebook, indent=2) + "\n"
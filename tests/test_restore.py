@@ -1,7 +1,11 @@
 """Tests for snapmyenv.restore module."""
 
+import importlib
+import os
+import sys
+
 import pytest
-from snapmyenv.capture import capture, clear_snapshots
+from snapmyenv.capture import capture, clear_snapshots, list_snapshots
 from snapmyenv.restore import restore, restore_from_dict
 from snapmyenv.exceptions import RestoreError
 from snapmyenv.models import EnvironmentSnapshot, Package
@@ -10,15 +14,19 @@ from snapmyenv.models import EnvironmentSnapshot, Package
 class TestRestore:
     """Tests for restore functionality."""
     
-    def setup_method(self):
-        """Clear snapshots before each test."""
-        clear_snapshots()
-    
     def test_restore_not_found(self):
         """Test restoring a non-existent snapshot."""
         with pytest.raises(RestoreError, match="not found"):
             restore("nonexistent")
     
+    def test_restore_not_found_lists_cached_snapshots(self):
+        """Test that the error names snapshots from the disk cache too."""
+        capture("earlier session")
+        clear_snapshots()
+        
+        with pytest.raises(RestoreError, match="Available snapshots: earlier session"):
+            restore("nonexistent")
+    
     def test_restore_dry_run(self):
         """Test restore in dry-run mode."""
         # Capture current environment
@@ -48,10 +56,171 @@ class TestRestore:
         
         # Dry run to avoid actual installation
         restore_from_dict(snapshot.to_dict(), dry_run=True)
+        
+        # Restoring from a dict must not register a session snapshot
+        assert list_snapshots() == []
     
     def test_restore_from_dict_invalid(self):
         """Test restoring from invalid dictionary."""
         invalid_data = {"invalid": "data"}
         
         with pytest.raises(RestoreError, match="Invalid snapshot"):
-            restore_from_dict(invalid_data)
\ No newline at end of file
+            restore_from_dict(invalid_data)
+
+    def test_restore_skips_satisfied_packages(self, capsys):
+        """Test that already-installed versions are not reinstalled."""
+        capture("test")
+        
+        restore("test", dry_run=True)
+        
+        output = capsys.readouterr().out
+        assert "already-satisfied" in output
+        assert "Would install" not in output
+        assert "0 packages to install" in output
+        
+        restore("test", dry_run=True, force=True)
+        
+        output = capsys.readouterr().out
+        assert "already-satisfied" not in output
+        assert "Would install" in output
+    
+    def test_restore_invalid_parallel(self):
+        """Test that a non-positive worker count is rejected."""
+        capture("test")
+        
+        with pytest.raises(RestoreError, match="parallel"):
+            restore("test", dry_run=True, parallel=0)
+    
+    def test_pip_script_must_match_interpreter(self, tmp_path):
+        """Test that a pip script bound to another Python is not used."""
+        from snapmyenv.restore import _script_uses_this_interpreter
+        
+        own = tmp_path / "pip-own"
+        own.write_text(f"#!{sys.executable}\nimport pip\n")
+        foreign = tmp_path / "pip-foreign"
+        foreign.write_text("#!/opt/other/bin/python2.7\nimport pip\n")
+        
+        assert _script_uses_this_interpreter(str(own))
+        assert not _script_uses_this_interpreter(str(foreign))
+    
+    def test_python_version_check_ignores_patch_level(self, recwarn):
+        """Test that only a major.minor difference triggers a warning."""
+        from snapmyenv.restore import check_python_version
+        
+        def snapshot_for(version):
+            return EnvironmentSnapshot(
+                name="test",
+                python_version=version,
+                platform_system="Linux",
+                platform_release="5.15.0",
+                platform_machine="x86_64",
+                is_colab=False,
+                packages=[],
+                timestamp="2024-01-01T00:00:00Z",
+                snapmyenv_version="0.1.0",
+            )
+        
+        major, minor = sys.version_info[:2]
+        check_python_version(snapshot_for(f"{major}.{minor}.999"))
+        assert len(recwarn) == 0
+        
+        with pytest.warns(UserWarning, match="version mismatch"):
+            check_python_version(snapshot_for(f"{major}.{minor + 1}.0"))
+    
+    def test_restore_empty_snapshot(self, capsys):
+        """Test that a snapshot without packages returns early."""
+        snapshot = EnvironmentSnapshot(
+            name="empty",
+            python_version=f"{sys.version_info.major}.{sys.version_info.minor}.0",
+            platform_system="Linux",
+            platform_release="5.15.0",
+            platform_machine="x86_64",
+            is_colab=False,
+            packages=[],
+            timestamp="2024-01-01T00:00:00Z",
+            snapmyenv_version="0.1.0",
+        )
+        
+        restore_from_dict(snapshot.to_dict())
+        
+        output = capsys.readouterr().out
+        assert "No packages to restore" in output
+        assert "Installing" not in output
+    
+    def test_restore_deduplicates_packages(self, capsys):
+        """Test that duplicate package entries are installed only once."""
+        snapshot = EnvironmentSnapshot(
+            name="dupes",
+            python_version=f"{sys.version_info.major}.{sys.version_info.minor}.0",
+            platform_system="Linux",
+            platform_release="5.15.0",
+            platform_machine="x86_64",
+            is_colab=False,
+            packages=[
+                Package(name="snapmyenv-missing", version="1.0"),
+                Package(name="Snapmyenv_Missing", version="2.0"),
+            ],
+            timestamp="2024-01-01T00:00:00Z",
+            snapmyenv_version="0.1.0",
+        )
+        
+        with pytest.warns(UserWarning, match="duplicate"):
+            restore_from_dict(snapshot.to_dict(), dry_run=True)
+        
+        output = capsys.readouterr().out
+        assert "snapmyenv-missing==1.0" in output
+        assert "Snapmyenv_Missing==2.0" not in output
+        
+        snapshot = EnvironmentSnapshot.from_dict(snapshot.to_dict())
+        assert snapshot.get_package("snapmyenv-missing").version == "1.0"
+    
+    def test_pip_cache_dir_from_environment(self, monkeypatch, tmp_path):
+        """Test that SNAPMYENV_CACHE selects pip's wheel cache."""
+        from snapmyenv.restore import _pip_cache_args
+        
+        monkeypatch.delenv("SNAPMYENV_CACHE", raising=False)
+        assert _pip_cache_args() == []
+        
+        monkeypatch.setenv("SNAPMYENV_CACHE", str(tmp_path))
+        assert _pip_cache_args() == ["--cache-dir", str(tmp_path)]
+    
+    def test_force_reinstall_runs_serially(self, monkeypatch):
+        """Test that forced reinstalls never use parallel shards."""
+        import subprocess
+        
+        restore_module = importlib.import_module("snapmyenv.restore")
+        calls = []
+        
+        def fake_install(requirements, extra_args=(), on_progress=None):
+            calls.append(list(extra_args))
+            return subprocess.CompletedProcess([], 0, None, b"")
+        
+        def no_shards(requirements, workers):
+            raise AssertionError("forced install must not be sharded")
+        
+        monkeypatch.setattr(restore_module, "_run_pip_install", fake_install)
+        monkeypatch.setattr(restore_module, "_install_shards", no_shards)
+        
+        packages = [Package(name=f"pkg{i}", version="1.0") for i in range(30)]
+        assert restore_module.batch_install_packages(packages, parallel=4, force=True)
+        assert calls == [["--force-reinstall"]]
+    
+    @pytest.mark.skipif(not hasattr(os, "killpg"), reason="needs process groups")
+    def test_interrupt_stops_parallel_shards(self, monkeypatch):
+        """Test that Ctrl+C kills running shard pips instead of waiting for them."""
+        import _thread
+        import threading
+        import time
+        
+        restore_module = importlib.import_module("snapmyenv.restore")
+        monkeypatch.setattr(
+            restore_module,
+            "_pip_command",
+            lambda: (sys.executable, "-c", "import time; time.sleep(30)"),
+        )
+        
+        threading.Timer(0.5, _thread.interrupt_main).start()
+        start = time.monotonic()
+        with pytest.raises(KeyboardInterrupt):
+            restore_module._install_shards(["a==1.0", "b==1.0"], 2)
+        assert time.monotonic() - start < 10
@@ -0,0 +1,109 @@
+"""Tests for snapmyenv.store module."""
+
+import pytest
+from snapmyenv.models import EnvironmentSnapshot, Package
+from snapmyenv.store import SnapshotStore, load_persisted_snapshot, persist_snapshot
+
+
+def make_snapshot(name):
+    """Create a small snapshot for store tests."""
+    return EnvironmentSnapshot(
+        name=name,
+        python_version="3.10.0",
+        platform_system="Linux",
+        platform_release="5.15.0",
+        platform_machine="x86_64",
+        is_colab=False,
+        packages=[Package(name="numpy", version="1.24.0")],
+        timestamp="2024-01-01T00:00:00Z",
+        snapmyenv_version="0.1.0",
+    )
+
+
+class TestSnapshotStore:
+    """Tests for SnapshotStore."""
+    
+    def test_store_and_get(self, tmp_path):
+        """Test storing and retrieving snapshots."""
+        store = SnapshotStore(spill_dir=tmp_path)
+        store["a"] = make_snapshot("a")
+        
+        assert store["a"].name == "a"
+        assert store.get("missing") is None
+        assert list(store) == ["a"]
+    
+    def test_spills_least_recently_used(self, tmp_path):
+        """Test that snapshots beyond the memory bound are spilled to disk."""
+        store = SnapshotStore(max_in_memory=2, spill_dir=tmp_path)
+        for name in ["a", "b", "c"]:
+            store[name] = make_snapshot(name)
+        
+        assert [p.name for p in tmp_path.iterdir()] == ["a.json"]
+        assert list(store) == ["a", "b", "c"]
+        
+        # Membership tests don't load spilled snapshots back
+        assert "a" in store
+        assert [p.name for p in tmp_path.iterdir()] == ["a.json"]
+        
+        # Loading a spilled snapshot spills the next least recently used one
+        restored = store["a"]
+        assert restored.name == "a"
+        assert restored.get_package("numpy").version == "1.24.0"
+        assert [p.name for p in tmp_path.iterdir()] == ["b.json"]
+    
+    def test_delete_and_clear(self, tmp_path):
+        """Test that removing snapshots also removes spilled files."""
+        store = SnapshotStore(max_in_memory=1, spill_dir=tmp_path)
+        for name in ["a", "b", "c"]:
+            store[name] = make_snapshot(name)
+        
+        del store["a"]
+        assert "a" not in store
+        assert len(store) == 2
+        
+        store.clear()
+        assert len(store) == 0
+        assert list(tmp_path.iterdir()) == []
+        
+        with pytest.raises(KeyError):
+            store["b"]
+    
+    def test_unspillable_snapshot_stays_in_memory(self, tmp_path):
+        """Test that one unserializable snapshot doesn't stop later spills."""
+        store = SnapshotStore(max_in_memory=2, spill_dir=tmp_path)
+        odd = make_snapshot("odd")
+        odd.metadata = {"n": {1, 2}}
+        store["odd"] = odd
+        for name in ["a", "b", "c"]:
+            store[name] = make_snapshot(name)
+        
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json", "b.json"]
+        assert store["odd"].metadata == {"n": {1, 2}}
+    
+    def test_missing_spill_file(self, tmp_path):
+        """Test that a vanished spill file makes the snapshot a clean KeyError."""
+        store = SnapshotStore(max_in_memory=1, spill_dir=tmp_path)
+        store["a"] = make_snapshot("a")
+        store["b"] = make_snapshot("b")
+        (tmp_path / "a.json").unlink()
+        
+        with pytest.warns(UserWarning, match="could not be read"):
+            with pytest.raises(KeyError):
+                store["a"]
+        assert "a" not in store
+        assert list(store) == ["b"]
+        with pytest.raises(KeyError):
+            store["a"]
+
+
+class TestPersistedSnapshots:
+    """Tests for the on-disk snapshot cache."""
+    
+    def test_invalid_cached_snapshot_is_ignored(self):
+        """Test that a hand-edited cache file is validated, not trusted."""
+        snapshot = make_snapshot("edited")
+        snapshot.packages = [Package.from_dict_unchecked({"name": "numpy", "version": ""})]
+        persist_snapshot(snapshot)
+        
+        with pytest.warns(UserWarning, match="version cannot be empty"):
+            assert load_persisted_snapshot("edited") is None
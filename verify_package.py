@@ -7,11 +7,21 @@ Run this before building/publishing.
 import sys
 import os
 from pathlib import Path
+from typing import Set
 
 
-def check_file_exists(path: Path, description: str) -> bool:
-    """Check if a file exists."""
-    if path.exists():
+def list_entries(directory: Path) -> Set[str]:
+    """List the entry names of a directory with a single scan."""
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def check_file_exists(path: Path, description: str, entries: Set[str]) -> bool:
+    """Check if a file exists among the scanned entries of its directory."""
+    if path.name in entries:
         print(f"✓ {description}: {path}")
         return True
     else:
@@ -29,24 +39,28 @@ def verify_package_structure():
     all_good = True
     
     # Core files
-    all_good &= check_file_exists(root / "pyproject.toml", "Build config")
-    all_good &= check_file_exists(root / "README.md", "README")
-    all_good &= check_file_exists(root / "LICENSE", "License")
+    root_entries = list_entries(root)
+    all_good &= check_file_exists(root / "pyproject.toml", "Build config", root_entries)
+    all_good &= check_file_exists(root / "README.md", "README", root_entries)
+    all_good &= check_file_exists(root / "LICENSE", "License", root_entries)
     
     # Package files
     pkg_root = root / "snapmyenv"
-    all_good &= check_file_exists(pkg_root / "__init__.py", "Package init")
-    all_good &= check_file_exists(pkg_root / "__version__.py", "Version")
-    all_good &= check_file_exists(pkg_root / "models.py", "Models")
-    all_good &= check_file_exists(pkg_root / "capture.py", "Capture")
-    all_good &= check_file_exists(pkg_root / "restore.py", "Restore")
-    all_good &= check_file_exists(pkg_root / "colab.py", "Colab utils")
-    all_good &= check_file_exists(pkg_root / "notebook.py", "Notebook")
-    all_good &= check_file_exists(pkg_root / "exceptions.py", "Exceptions")
+    pkg_entries = list_entries(pkg_root)
+    all_good &= check_file_exists(pkg_root / "__init__.py", "Package init", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "__version__.py", "Version", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "models.py", "Models", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "capture.py", "Capture", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "restore.py", "Restore", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "colab.py", "Colab utils", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "notebook.py", "Notebook", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "exceptions.py", "Exceptions", pkg_entries)
+    all_good &= check_file_exists(pkg_root / "store.py", "Snapshot store", pkg_entries)
     
     # Test files
     test_root = root / "tests"
-    all_good &= check_file_exists(test_root / "__init__.py", "Tests init")
+    test_entries = list_entries(test_root)
+    all_good &= check_file_exists(test_root / "__init__.py", "Tests init", test_entries)
     
     print()
     return all_good